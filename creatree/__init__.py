@@ -1,7 +1,8 @@
 """
 The main module for the creatree package.
 
-This module exports the `creatree` and `tree_to_dict` functions from the `main` module.
+This module exports the `creatree`, `creatree_stream`, `tree_to_dict` and `tree_to_dicts_parallel` functions
+from the `main` module.
 
 Example Usage:
     >>> # import the creatree and tree_to_dict functions
@@ -39,6 +40,6 @@ Example Usage:
     │   └─ utils.py
     └─ empty_directory/
 """
-from .core import creatree, tree_to_dict
+from .core import creatree, creatree_stream, tree_to_dict, tree_to_dicts_parallel
 
-__all__ = ["creatree", "tree_to_dict"]
+__all__ = ["creatree", "creatree_stream", "tree_to_dict", "tree_to_dicts_parallel"]
@@ -0,0 +1,207 @@
+"""
+Batched file creation using `io_uring` (Linux only).
+
+This module is used by `creatree.core` when the optional `liburing` dependency is installed
+(`pip install creatree[uring]`) and the kernel supports direct descriptors (Linux 5.15+).
+Each file is created with a chain of linked `openat` -> `write` -> `close` requests,
+and the whole batch is submitted to the kernel with a single syscall.
+"""
+
+import errno
+import os
+import sys
+from functools import lru_cache
+from typing import Iterator
+
+liburing = None
+"""
+The `liburing` module, imported by `uring_available` on first use (importing it takes a few milliseconds).
+"""
+
+URING_BATCH_SIZE = 256
+"""
+Maximum number of files submitted to the ring at once (each file takes up to 3 requests).
+"""
+
+_OPEN, _WRITE, _CLOSE = range(3)
+
+
+def _kernel_supported() -> bool:
+    """Check if the running kernel supports `io_uring` direct descriptors (Linux 5.15+)."""
+    try:
+        major, minor = (int(part) for part in os.uname().release.split(".")[:2])
+    except ValueError:
+        return False
+    return (major, minor) >= (5, 15)
+
+
+@lru_cache(maxsize=None)
+def uring_available() -> bool:
+    """
+    Check whether files can be created using `io_uring` on this system, importing `liburing` if so.
+
+    The check only runs once, on the first call.
+
+    Returns:
+        bool: Whether `write_files_uring` can be used.
+    """
+    global liburing
+    if sys.platform != "linux" or not _kernel_supported():
+        return False
+    try:
+        import liburing as _liburing
+    except ImportError:  # pragma: no cover - optional dependency
+        return False
+    liburing = _liburing
+    return True
+
+
+def write_files_uring(files: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    """
+    Create the given files using `io_uring`, leaving existing files untouched.
+
+    Args:
+        files (list[tuple[str, str]]): The files to be created along with their content.
+
+    Returns:
+        list[tuple[str, str]]: The files that were not created and are left for the caller,
+            i.e. the files whose parent directory does not exist, or all of them if `io_uring`
+            is not available or the ring cannot be set up (e.g. it is disabled by the kernel or a sandbox).
+
+    Raises:
+        OSError: If a file cannot be created.
+    """
+    if not files or not uring_available():
+        return files
+
+    missing_parent: list[tuple[str, str]] = []
+    batch_size = min(URING_BATCH_SIZE, len(files))
+
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    try:
+        liburing.io_uring_queue_init(batch_size * 3, ring)
+    except OSError:
+        return files
+    try:
+        # Sparse table of direct descriptors, so that the linked requests can refer to
+        # a file before it is opened (slot `i` is used by the `i`th file of a batch)
+        try:
+            liburing.io_uring_register_files_sparse(ring, batch_size)
+        except OSError:
+            return files
+        for start in range(0, len(files), batch_size):
+            batch = files[start : start + batch_size]
+            _submit_batch(ring, cqe, batch, missing_parent)
+    finally:
+        liburing.io_uring_queue_exit(ring)
+
+    return missing_parent
+
+
+def _submit_batch(
+    ring: "liburing.Ring",
+    cqe: "liburing.Cqe",
+    batch: list[tuple[str, str]],
+    missing_parent: list[tuple[str, str]],
+) -> None:
+    """Submit and reap the linked `openat` -> `write` -> `close` requests for a batch of files."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+    # The kernel reads the paths and buffers only on submission,
+    # so they need to be kept alive until the whole batch has completed
+    paths: list[str] = []
+    datas: list[bytes] = []
+    requests = 0
+
+    for slot, (path, content) in enumerate(batch):
+        path = os.fspath(path)
+        data = content.encode("utf-8")
+        paths.append(path)
+        datas.append(data)
+
+        sqe = liburing.io_uring_get_sqe(ring)
+        liburing.io_uring_prep_open_direct(sqe, path, flags=flags, file_index=slot, mode=0o666)
+        liburing.io_uring_sqe_set_flags(sqe, liburing.IOSQE_IO_LINK)
+        liburing.io_uring_sqe_set_data64(sqe, slot * 3 + _OPEN)
+        requests += 1
+
+        if data:
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_write(sqe, slot, data)
+            liburing.io_uring_sqe_set_flags(sqe, liburing.IOSQE_FIXED_FILE | liburing.IOSQE_IO_LINK)
+            liburing.io_uring_sqe_set_data64(sqe, slot * 3 + _WRITE)
+            requests += 1
+
+        sqe = liburing.io_uring_get_sqe(ring)
+        liburing.io_uring_prep_close_direct(sqe, slot)
+        liburing.io_uring_sqe_set_data64(sqe, slot * 3 + _CLOSE)
+        requests += 1
+
+    liburing.io_uring_submit_and_wait(ring, requests)
+
+    error: OSError | None = None
+    short_writes: list[tuple[str, bytes, int]] = []
+    unclosed: list[int] = []
+    for slot, op, result in _reap(ring, cqe, requests):
+        if isinstance(result, OSError):
+            if result.errno == errno.ECANCELED:
+                # Requests linked after a failed `openat` (or a failed or short write) are cancelled
+                pass
+            elif op == _OPEN and result.errno == errno.EEXIST:
+                # If the file already exists, skip it
+                pass
+            elif op == _OPEN and result.errno == errno.ENOENT:
+                missing_parent.append(batch[slot])
+            else:
+                if op == _WRITE:
+                    unclosed.append(slot)
+                if error is None:
+                    error = OSError(result.errno, os.strerror(result.errno), str(batch[slot][0]))
+        elif op == _WRITE and result < len(datas[slot]):
+            # The rest of the content is written once the batch has completed
+            short_writes.append((paths[slot], datas[slot], result))
+            unclosed.append(slot)
+
+    if unclosed:
+        # A failed or short write breaks the link, so its `close` is cancelled.
+        # Close the files explicitly, before their slots are reused by the next batch
+        for slot in unclosed:
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_close_direct(sqe, slot)
+            liburing.io_uring_sqe_set_data64(sqe, slot * 3 + _CLOSE)
+        liburing.io_uring_submit_and_wait(ring, len(unclosed))
+        for slot, _, result in _reap(ring, cqe, len(unclosed)):
+            if isinstance(result, OSError) and error is None:
+                error = OSError(result.errno, os.strerror(result.errno), str(batch[slot][0]))
+
+    if error is not None:
+        raise error
+
+    for path, data, offset in short_writes:
+        _write_remaining(path, data, offset)
+
+
+def _reap(ring: "liburing.Ring", cqe: "liburing.Cqe", count: int) -> Iterator[tuple[int, int, int | OSError]]:
+    """Reap `count` completions, yielding the slot, operation and result (or error) of each request."""
+    for _ in range(count):
+        liburing.io_uring_wait_cqe(ring, cqe)
+        entry = cqe[0]
+        slot, op = divmod(entry.user_data, 3)
+        try:
+            # `liburing` raises failed results (negative errno) as `OSError`
+            result = entry.res
+        except OSError as e:
+            result = e
+        # Advance before yielding, so that the entry is consumed even if the caller stops early
+        liburing.io_uring_cq_advance(ring, 1)
+        yield slot, op, result
+
+
+def _write_remaining(path: str, data: bytes, offset: int) -> None:
+    """Write the content of a file past `offset`, after a short write."""
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        while offset < len(data):
+            offset += os.pwrite(fd, data[offset:], offset)
+    finally:
+        os.close(fd)
@@ -19,18 +19,19 @@ from pathlib import Path
 import sys
 import argparse
 
-from creatree.core import creatree
+from creatree.core import creatree_stream
 
 
 def format_paths(paths: list[Path]):
-    return "'" + "', '".join(map(lambda x: x.absolute().as_posix(), paths)) + "'"
+    # Resolve the current working directory once, instead of once per path in `Path.absolute`
+    cwd = Path.cwd()
+    return "'" + "', '".join((path if path.is_absolute() else cwd / path).as_posix() for path in paths) + "'"
 
 def creatree_cli(tree_string: str, where: str = "."):
-    # Create the directory tree
-    tree_dict = creatree(tree_string, where)
-    roots = list(tree_dict.keys())
+    # Create the directory tree (on the fly, as the tree dictionary is not needed here)
+    roots = creatree_stream(tree_string, where)
 
-    print(f"Created tree{'s' if len(roots) > 1 else ''} in {', '.join(format_paths(roots))}")
+    print(f"Created tree{'s' if len(roots) > 1 else ''} in {format_paths(roots)}")
 
 
 def main():
@@ -63,12 +64,11 @@ def main():
         if not os.path.isfile(tree_file):
             raise Exception(f"{tree_file} is not a file")
         
-        # Read from file
-        with open(tree_file, "r", encoding="utf-8") as f:
-            tree_string = f.read()
+        # Read from file (decoding the raw bytes in one go, without the text layer)
+        tree_string = Path(tree_file).read_bytes().decode("utf-8")
     else:
         # Read from stdin (pipe)
-        tree_string = sys.stdin.read()
+        tree_string = sys.stdin.buffer.read().decode("utf-8")
 
     creatree_cli(tree_string=tree_string, where=args.where)
 
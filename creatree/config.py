@@ -1,14 +1,16 @@
 import re
 
+from creatree.utils import build_line_regex
+
 
 COMMENT_START_CHAR = "#"
 """
 Character used to indicate the start of a comment.
 """
 
-COMMENT_FINDER_REGEX = re.compile(f"{COMMENT_START_CHAR}\s+(.*)")
+COMMENT_FINDER_REGEX = re.compile(rf"{re.escape(COMMENT_START_CHAR)}\s+(.*)")
 """
-Regular expression to find the comment associated with a file or directory.
+Regular expression to find the comment associated with a file or directory (use it with `search`).
 """
 
 COMMENT_KEY = "___comment___"
@@ -20,3 +22,34 @@ PREFIXES = ["├──", "└──", "├─", "└─", "│──", "│─",
 """
 List of prefixes used to identify file names. These prefixes are taken from common tree representations.
 """
+
+PARALLEL_PARSE_THRESHOLD = 4
+"""
+Minimum number of trees before they are parsed using a process pool (see `tree_to_dicts_parallel`).
+"""
+
+PARALLEL_WRITE_THRESHOLD = 16
+"""
+Minimum number of files in a tree before they are written using a thread pool.
+Below this, the thread pool startup cost outweighs the overlapped syscalls.
+"""
+
+MAX_WRITE_WORKERS = 32
+"""
+Maximum number of threads used to write files in parallel.
+"""
+
+STREAM_BATCH_SIZE = 256
+"""
+Number of files buffered by `creatree_stream` before they are written together.
+"""
+
+PREFIX_FIRST_CHARS = frozenset(prefix[0] for prefix in PREFIXES)
+"""
+Set of characters the default `PREFIXES` start with. Lines without any of these characters can only be roots.
+"""
+
+LINE_REGEX = build_line_regex(PREFIXES, COMMENT_START_CHAR)
+"""
+Precompiled regular expression to parse the name, position and comment of a line using the default `PREFIXES`.
+"""
@@ -4,20 +4,30 @@ The core module for the creatree package.
 This module contains the `creatree` function along with supporting functions.
 """
 
+import errno
+import os
 import re
+import sys
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import NamedTuple
+from typing import Iterable, Iterator, NamedTuple
 
+from creatree._uring import uring_available, write_files_uring
 from creatree.config import (
-    COMMENT_FINDER_REGEX,
     COMMENT_KEY,
     COMMENT_START_CHAR,
+    LINE_REGEX,
+    MAX_WRITE_WORKERS,
+    PARALLEL_PARSE_THRESHOLD,
+    PARALLEL_WRITE_THRESHOLD,
+    PREFIX_FIRST_CHARS,
     PREFIXES,
+    STREAM_BATCH_SIZE,
 )
 from creatree.utils import (
-    build_or_regex,
+    build_line_regex,
     is_root,
-    remove_comments,
+    iter_lines,
     replace_empty_dict_with_none,
 )
 
@@ -42,58 +52,110 @@ class FileMetadata(NamedTuple):
         return f"{' ' * self.index} {self.name}"
 
 
-def _build_metadata_list(
+@lru_cache(maxsize=32)
+def _compile_line_regex(prefixes: tuple[str, ...]) -> re.Pattern:
+    """Compile (and cache) the line parsing regular expression for a custom set of prefixes."""
+    return build_line_regex(prefixes, COMMENT_START_CHAR)
+
+
+def _get_line_parser(prefixes: list[str]) -> tuple[re.Pattern, frozenset[str]]:
+    """Get the line parsing regular expression and the set of characters the prefixes start with."""
+    if prefixes is PREFIXES:
+        return LINE_REGEX, PREFIX_FIRST_CHARS
+    return _compile_line_regex(tuple(prefixes)), frozenset(prefix[0] for prefix in prefixes if prefix)
+
+
+def _split_root_line(stripped: str) -> tuple[str, str]:
+    """Split a (left stripped) line without any prefix into its name and comment."""
+    # Like in the line regex, the comment starts at the first comment character followed by whitespace
+    start = stripped.find(COMMENT_START_CHAR)
+    while start != -1 and not stripped[start + 1 : start + 2].isspace():
+        start = stripped.find(COMMENT_START_CHAR, start + 1)
+    if start == -1:
+        return stripped.rstrip(), ""
+    return stripped[:start].rstrip(), stripped[start + 1 :].lstrip()
+
+
+def _iter_metadata(
     tree: str, prefixes: list[str] = PREFIXES
-) -> list[FileMetadata]:
+) -> Iterator[tuple[str, int, int, str]]:
     """
-    Build a list of file metadata from a tree string.
+    Lazily parse the file metadata from a tree string, one line at a time.
+
+    The metadata is yielded as plain tuples (in the same order as the `FileMetadata` fields),
+    which are much cheaper to create than `FileMetadata` instances in this hot loop.
 
     Args:
         tree (str): The tree string to be parsed.
         prefixes (list[str], optional): The list of prefixes
             to be used to identify file names. Defaults to PREFIXES.
 
-    Returns:
-        list[FileMetadata]: The list of file metadata.
+    Yields:
+        tuple[str, int, int, str]: The name, index, line number and comment of each file or directory,
+            in order of appearance.
     """
 
-    # Regular expression to find the name of a file or directory
-    name_finder_regex = re.compile(f"(?:{build_or_regex(prefixes)})\s*(\S+)")
+    # Regular expression to parse the name and comment of a file or directory
+    line_regex, prefix_first_chars = _get_line_parser(prefixes)
 
-    datalist: list[FileMetadata] = []
-    lines = tree.strip().splitlines()
+    lines = iter_lines(tree.strip())
 
     for lno, line in enumerate(lines):
-        # Find any comment associated with the file or directory
-        comment = (COMMENT_FINDER_REGEX.findall(line) or [""])[0]
+        stripped = line.lstrip()
+        if not stripped:
+            continue
+
+        # Find the name of the file or directory. Only lines containing a prefix character
+        # need the (costlier) prefix alternation, any other line can only be a root.
+        # Most lines start with their prefix, so check the first character before scanning the line
+        # (it can also start with an indentation glyph, e.g. `│` when it isn't part of a custom prefix)
+        if stripped[0] in prefix_first_chars or not prefix_first_chars.isdisjoint(stripped):
+            match = line_regex.match(line)
+        else:
+            match = None
+        if match:
+            name = match.group("name")
+            index = match.start("name")
+            # Find any comment associated with the file or directory
+            comment = match.group("comment") or ""
+        else:
+            # If the line is a root, assign the whole line (without the comment) as the name
+            name, comment = _split_root_line(stripped)
+            if not is_root(name):
+                continue
+            # Roots are always top level, whatever their indentation (e.g. in an indented triple-quoted string)
+            index = 0
 
-        # Remove the comment from the line
-        if comment:
-            line = line.split(COMMENT_START_CHAR)[0].strip()
+        # Names repeat a lot across trees (e.g. `__init__.py`), interning them lets the dicts compare keys by identity
+        yield sys.intern(name), index, lno, comment
 
-        # Find the name of the file or directory
-        name: str = (name_finder_regex.findall(line) or [""])[0]
 
-        if not name:
-            # If the line is a root, assign the whole line as the name
-            if not is_root(line):
-                continue
-            name = line
+def _build_metadata_list(
+    tree: str, prefixes: list[str] = PREFIXES
+) -> list[FileMetadata]:
+    """
+    Build a list of file metadata from a tree string.
 
-        index = line.find(name)
-        datalist.append(FileMetadata(name, index, lno, comment))
+    Args:
+        tree (str): The tree string to be parsed.
+        prefixes (list[str], optional): The list of prefixes
+            to be used to identify file names. Defaults to PREFIXES.
 
-    return datalist
+    Returns:
+        list[FileMetadata]: The list of file metadata.
+    """
+    return [FileMetadata._make(item) for item in _iter_metadata(tree, prefixes)]
 
 
 def _build_tree_dict(
-    datalist: list[FileMetadata], include_comments: bool = True
+    datalist: Iterable[tuple[str, int, int, str]], include_comments: bool = True
 ) -> dict[str, dict]:
     """
     Build a dictionary from the list of file metadata.
 
     Args:
-        datalist (list[FileMetadata]): The list of file metadata.
+        datalist (Iterable[tuple[str, int, int, str]]): The file metadata, either as `FileMetadata`
+            or as plain (name, index, line number, comment) tuples.
         include_comments (bool, optional): Whether to include comments in the dictionary. Defaults to True.
 
     Returns:
@@ -102,23 +164,20 @@ def _build_tree_dict(
     tree = {}
     path_stack = []  # Stack to maintain the hierarchy
 
-    for item in datalist:
-        name = item.name
-        index = item.index
-
+    for name, index, _, comment in datalist:
         # Find the parent based on indentation
         while path_stack and path_stack[-1][1] >= index:
             path_stack.pop()
 
         # Get the current working dictionary level
         parent = tree if not path_stack else path_stack[-1][0]
-        parent[name] = {COMMENT_KEY: item.comment}  # Initialize directory/file
+        # Initialize directory/file (only storing the comment if it has to be kept)
+        parent[name] = {COMMENT_KEY: comment} if include_comments else {}
 
         # If it's a directory, push it to the stack
         path_stack.append((parent[name], index))
 
     if not include_comments:
-        tree = remove_comments(tree, COMMENT_KEY)
         tree = replace_empty_dict_with_none(tree)
 
     return tree
@@ -163,41 +222,218 @@ def tree_to_dict(
         }
         >>> # Notice that the 'empty_directory/' directory has an empty dictionary indicating it is a directory
     """
-    # Build a list of file metadata from the tree string
-    metadata_list = _build_metadata_list(tree, prefixes)
+    # Parse the file metadata from the tree string
+    metadata = _iter_metadata(tree, prefixes)
 
-    # Build and return the tree dictionary from the metadata list
-    return _build_tree_dict(metadata_list, include_comments)
+    # Build and return the tree dictionary from the metadata
+    return _build_tree_dict(metadata, include_comments)
 
 
-def create_tree(tree_dict: dict[str, dict], root: Path = Path(".")) -> None:
+def split_trees(tree: str, prefixes: list[str] = PREFIXES) -> list[str]:
     """
-    Recursively create the directory tree (in the local filesystem) based on the given tree dictionary.
+    Split a string holding several trees into one tree string per root.
+
+    A new tree starts at every root, i.e. at every line that `tree_to_dict` parses as a root,
+    so that converting each of the trees gives the same roots as converting `tree`.
+
+    Args:
+        tree (str): The string holding one or more directory trees.
+        prefixes (list[str], optional): The list of prefixes used to identify file names. Defaults to PREFIXES.
+
+    Returns:
+        list[str]: The tree strings, one per root.
+
+    Example:
+        >>> from creatree.core import split_trees
+        >>> split_trees("root1/\\n├── a.py\\nroot2/\\n└── b.py")
+        ['root1/\\n├── a.py', 'root2/\\n└── b.py']
+    """
+    line_regex, _ = _get_line_parser(prefixes)
+    lines = tree.strip().splitlines()
+
+    starts = [0]
+    for lno in range(1, len(lines)):
+        line = lines[lno]
+        stripped = line.lstrip()
+        # Same check as in `_iter_metadata` for a root (a line without any prefix)
+        if stripped and not line_regex.match(line) and is_root(_split_root_line(stripped)[0]):
+            starts.append(lno)
+    starts.append(len(lines))
+
+    return ["\n".join(lines[start:end]) for start, end in zip(starts, starts[1:])]
+
+
+def tree_to_dicts_parallel(
+    trees: list[str],
+    include_comments: bool = True,
+    prefixes: list[str] = PREFIXES,
+    max_workers: int | None = None,
+) -> list[dict[str, dict]]:
+    """
+    Convert several independent tree strings to their dictionary representations, using multiple processes.
+
+    As starting the worker processes is costly, fewer than `PARALLEL_PARSE_THRESHOLD` trees are converted
+    in the current process. When running as a script, call this under an `if __name__ == "__main__":` guard
+    (required by multiprocessing on platforms that spawn processes).
+
+    Args:
+        trees (list[str]): The tree strings to be converted (see `split_trees` to split a multi-root string).
+        include_comments (bool, optional): Whether to include comments in the tree dictionaries. Defaults to True.
+        prefixes (list[str], optional): The list of prefixes used to identify file names. Defaults to PREFIXES.
+        max_workers (int | None, optional): The maximum number of worker processes.
+            Defaults to the number of processors.
+
+    Returns:
+        list[dict[str, dict]]: The tree dictionaries, in the same order as `trees`.
+
+    Example:
+        >>> from creatree import tree_to_dicts_parallel
+        >>> from creatree.core import split_trees
+        >>> tree_to_dicts_parallel(split_trees("root1/\\n├── a.py\\nroot2/\\n└── b.py"), include_comments=False)
+        [{'root1/': {'a.py': None}}, {'root2/': {'b.py': None}}]
+    """
+    convert = partial(tree_to_dict, include_comments=include_comments, prefixes=prefixes)
+    if len(trees) < PARALLEL_PARSE_THRESHOLD:
+        return [convert(tree) for tree in trees]
+
+    # Imported here, as it pulls in `multiprocessing` (slowing down every import of creatree, e.g. for the CLI)
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(convert, trees))
+
+
+def _make_dir(path: str) -> None:
+    """
+    Create a directory, doing nothing if it already exists.
+
+    Args:
+        path (str): The path of the directory to be created.
+    """
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        if not os.path.isdir(path):
+            raise
+    except FileNotFoundError:
+        # The parent only needs creating when the key spans several segments, e.g. "a/b/"
+        os.makedirs(path, exist_ok=True)
+
+
+def _write_new_file(path: str, content: str) -> None:
+    """
+    Create a file with the given content, leaving it untouched if it already exists.
+
+    Args:
+        path (str): The path of the file to be created.
+        content (str): The content to be written to the file.
+    """
+    # O_EXCL fuses the existence check and the creation into a single syscall
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL
+    try:
+        fd = os.open(path, flags, 0o666)
+    except FileExistsError:
+        # If the file already exists, skip it
+        return
+    except FileNotFoundError:
+        # The parent only needs creating when the key spans several segments, e.g. "docs/index.md"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            fd = os.open(path, flags, 0o666)
+        except FileExistsError:
+            return
+    try:
+        # Unlike `file.write`, `os.write` may write only part of the data
+        data = memoryview(content.encode("utf-8"))
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
+def _flatten_tree(
+    tree_dict: dict[str, dict], root: str
+) -> tuple[list[str], list[tuple[str, str]]]:
+    """
+    Flatten the tree dictionary into the directories and files to be created under `root`.
+
+    Paths are kept as plain strings, which are cheaper to build than `Path` objects.
+
+    Args:
+        tree_dict (dict[str, dict]): The dictionary representing the directory tree.
+        root (str): The directory to create the directory tree in.
+
+    Returns:
+        tuple[list[str], list[tuple[str, str]]]: The directories (every parent before its children)
+            and the files along with their content.
+    """
+    dirs: list[str] = []
+    files: list[tuple[str, str]] = []
+
+    stack = [(tree_dict, root)]
+    while stack:
+        subtree, parent = stack.pop()
+        for key, value in subtree.items():
+            path = os.path.join(parent, key) if key != "." else parent
+
+            # Extract the comment associated with the file or directory
+            # (this only mutates the child, so iterating `subtree` itself is safe)
+            comment = value.pop(COMMENT_KEY, "") if value else ""
+            if value or key.endswith("/"):
+                dirs.append(path)
+                stack.append((value, path))
+            else:
+                # If the comment is not empty, add the comment to the file
+                files.append((path, f"# {comment}" if comment else ""))
+
+    return dirs, files
+
+
+def _write_files(files: list[tuple[str, str]]) -> None:
+    """
+    Write the given files, batching the syscalls using `io_uring` when available,
+    or overlapping them using a thread pool for larger trees.
+
+    Args:
+        files (list[tuple[str, str]]): The files to be created along with their content.
+    """
+    # `liburing` is only imported here, so that importing creatree (e.g. for the CLI) does not pay for it
+    if len(files) > 1 and uring_available():
+        # Anything left over (e.g. files whose parent is missing) goes through the regular path
+        files = write_files_uring(files)
+
+    if len(files) < PARALLEL_WRITE_THRESHOLD:
+        for path, content in files:
+            _write_new_file(path, content)
+        return
+
+    # Imported here, as `concurrent.futures` (and the `logging` it imports) slows down every import of creatree
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WRITE_WORKERS, len(files))) as executor:
+        # Consume the results so that any exception is raised here
+        list(executor.map(lambda file: _write_new_file(*file), files))
+
+
+def create_tree(tree_dict: dict[str, dict], root: str | Path = ".") -> None:
+    """
+    Create the directory tree (in the local filesystem) based on the given tree dictionary.
 
     Args:
         tree_dict (dict[str, dict]): The dictionary representing the directory tree.
-        root (Path, optional): The root directory to start creating the directory tree from.
+        root (str | Path, optional): The root directory to start creating the directory tree from.
             Defaults to the current working directory.
     """
-    _tree_dict = tree_dict.copy()
-    for key, value in _tree_dict.items():
-        path = Path(root, key) if key != "." else Path(root)
-
-        # Extract the comment associated with the file or directory
-        comment = (value or {}).pop(COMMENT_KEY, "")
-        # If the comment is not empty, add the comment to the file
-        comment = f"# {comment}" if comment else ""
-        if value or key.endswith("/"):
-            path.mkdir(parents=True, exist_ok=True)
-            # Recursively create the subtree
-            create_tree(value, path)
-        else:
-            if path.exists():
-                # If the file already exists, skip it
-                continue
-            path.parent.mkdir(parents=True, exist_ok=True)
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(comment)
+    root = os.fspath(root)
+    dirs, files = _flatten_tree(tree_dict, root)
+
+    # Create the root once, every nested directory is created before its children
+    os.makedirs(root, exist_ok=True)
+    for path in dirs:
+        _make_dir(path)
+
+    # Directories are in place, so the files can be written in any order
+    _write_files(files)
 
 
 def creatree(
@@ -248,3 +484,89 @@ def creatree(
     create_tree(tree_dict, where_to_create)
     tree_dict = {(where_to_create / k): v for k, v in tree_dict.items()}
     return tree_dict
+
+
+def creatree_stream(
+    tree: str,
+    where_to_create: str = ".",
+    prefixes: list[str] = PREFIXES,
+) -> list[Path]:
+    """
+    Parse a directory tree string and create the directory tree on the fly, without building the tree dictionary.
+
+    Each line is created as soon as the next one tells whether it is a directory (it has children or ends with /)
+    or a file, so only the current branch of the tree is kept in memory. Files are still written in batches
+    of `STREAM_BATCH_SIZE`, like in `create_tree`.
+
+    The created tree is the same as with `creatree`, except when a name is repeated among siblings.
+    `creatree` only keeps the last one (like the keys of `tree_to_dict`), while here the first one wins:
+    the contents of repeated directories are merged, a repeated file keeps the content of its first line,
+    a file repeating a directory is skipped and a directory repeating a file raises `FileExistsError`
+    (as it does when the file already exists on disk).
+
+    Args:
+        tree (str): The directory tree string to be parsed.
+        where_to_create (str, optional): The directory to create the directory tree from.
+            Defaults to the current working directory.
+        prefixes (list[str], optional): The list of prefixes to be used to identify file names.
+            Defaults to PREFIXES.
+
+    Returns:
+        list[Path]: The root directories (or files) of the created trees, each listed once.
+
+    Example:
+        >>> from creatree import creatree_stream
+        >>> tree = '''
+        ...     example_project/ # Project root
+        ...     │── main.py # Main entry point
+        ...     │── src
+        ...     │   │── app.py
+        ... '''
+        >>> creatree_stream(tree, where_to_create=".")
+        [PosixPath('example_project')]
+    """
+    root = os.fspath(where_to_create)
+    os.makedirs(root, exist_ok=True)
+
+    roots: dict[Path, None] = {}  # Ordered set, repeated roots are only listed once
+    files: dict[str, str] = {}  # Files (and their content) waiting to be written
+    path_stack: list[tuple[str, int]] = []  # Stack of the (path, index) of the current branch's directories
+    pending: tuple[str, int, str, str] | None = None  # Last item, not yet known to be a file or a directory
+
+    def realize(name: str, comment: str, path: str, has_children: bool) -> None:
+        if has_children or name.endswith("/"):
+            # Fail the same way whether the file listed earlier has already been written or not
+            if files and path.rstrip("/") in files:
+                raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), path)
+            _make_dir(path)
+        else:
+            # If the comment is not empty, add the comment to the file (the first of repeated files wins)
+            files.setdefault(path, f"# {comment}" if comment else "")
+            if len(files) >= STREAM_BATCH_SIZE:
+                _write_files(list(files.items()))
+                files.clear()
+
+    for name, index, _, comment in _iter_metadata(tree, prefixes):
+        if pending:
+            pending_name, pending_index, pending_comment, pending_path = pending
+            has_children = index > pending_index
+            realize(pending_name, pending_comment, pending_path, has_children)
+            if has_children:
+                path_stack.append((pending_path, pending_index))
+
+        # Find the parent based on indentation
+        while path_stack and path_stack[-1][1] >= index:
+            path_stack.pop()
+
+        parent = path_stack[-1][0] if path_stack else root
+        path = os.path.join(parent, name) if name != "." else parent
+        if not path_stack:
+            roots[Path(path)] = None
+        pending = (name, index, comment, path)
+
+    if pending:
+        pending_name, _, pending_comment, pending_path = pending
+        realize(pending_name, pending_comment, pending_path, has_children=False)
+    _write_files(list(files.items()))
+
+    return list(roots)
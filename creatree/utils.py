@@ -1,21 +1,75 @@
 import re
+from typing import Iterator
 
 
 def is_root(line: str):
     """Determine if a given line of a directory tree string represents the root."""
     return line == "." or len(line.strip()) > 1
 
+def iter_lines(text: str, chunk_size: int = 1 << 16) -> Iterator[str]:
+    """
+    Lazily iterate over the lines of a string, without building the list of all the lines up front.
+
+    The string is split in chunks of (roughly) `chunk_size` characters, cut at newlines,
+    so that only the lines of one chunk are alive at a time.
+
+    Args:
+        text (str): The string to be split into lines.
+        chunk_size (int, optional): The minimum number of characters per chunk. Defaults to 65536.
+
+    Yields:
+        str: Each line of the string, without the newline (same as `str.splitlines`).
+    """
+    start = 0
+    size = len(text)
+    while start < size:
+        end = text.find("\n", start + chunk_size)
+        if end == -1:
+            end = size
+        # Keep the newline in the chunk, so that splitting it gives the same lines as splitting the whole string
+        yield from text[start : end + 1].splitlines()
+        start = end + 1
+
+
 def build_or_regex(options: list[str]):
     """
     Build a regular expression pattern that matches any of the given options.
 
+    The options are tried longest first, so that an option is never shadowed
+    by one of its own prefixes (e.g. `|-` would otherwise match before `|--`).
+
     Args:
         options (list[str]): A list of strings to be matched.
 
     Returns:
         str: A regular expression string that matches any of the provided options.
     """
-    return "|".join(re.escape(option) for option in (options))
+    return "|".join(re.escape(option) for option in sorted(options, key=len, reverse=True))
+
+
+def build_line_regex(prefixes: list[str], comment_start_char: str = "#") -> re.Pattern:
+    """
+    Build a regular expression that parses a single (non-root) line of a directory tree string.
+
+    The regex is meant to be used with `match`. It scans up to the first prefix
+    (outside of any comment) and exposes the following named groups:
+        - `name`: The name of the file or directory following the prefix (up to any comment).
+        - `comment`: The comment associated with the file or directory (None if absent).
+
+    Lines without any prefix (i.e. roots) do not match and are left to the caller.
+
+    Args:
+        prefixes (list[str]): The list of prefixes used to identify file names.
+        comment_start_char (str, optional): Character used to indicate the start of a comment. Defaults to "#".
+
+    Returns:
+        re.Pattern: The compiled regular expression.
+    """
+    comment_start_char = re.escape(comment_start_char)
+    return re.compile(
+        rf"[^{comment_start_char}]*?(?:{build_or_regex(prefixes)})\s*(?P<name>(?:(?!{comment_start_char}\s)\S)+)"
+        rf"(?:.*?{comment_start_char}\s+(?P<comment>.*))?"
+    )
 
 
 def remove_comments(tree_dict: dict[str, dict], comment_key: str) -> dict[str, dict]:
@@ -46,12 +100,14 @@ def replace_empty_dict_with_none(tree_dict: dict[str, dict]) -> dict[str, dict |
     Returns:
         dict[str, dict | None]: The dictionary with empty directories replaced with None.
     """
-    for key, value in tree_dict.items():
-        # Replace empty directories with None if they don't end with /
-        if not value and not key.endswith("/"):
-            tree_dict[key] = None
-        
-        # Recursively replace empty directories    
-        if value:
-            replace_empty_dict_with_none(value)
+    # Walk the tree iteratively, so that deep trees don't hit the recursion limit
+    stack = [tree_dict]
+    while stack:
+        node = stack.pop()
+        for key, value in node.items():
+            if value:
+                stack.append(value)
+            # Replace empty directories with None if they don't end with /
+            elif not key.endswith("/"):
+                node[key] = None
     return tree_dict
@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import creatree
+
+from creatree._uring import URING_BATCH_SIZE, _write_remaining, uring_available, write_files_uring
+
+
+def _write_files_uring(files):
+    """Call `write_files_uring`, skipping the test if the ring cannot be set up (e.g. in a sandbox)."""
+    leftovers = write_files_uring(files)
+    if files and leftovers == files:
+        pytest.skip("io_uring cannot be set up on this system")
+    return leftovers
+
+
+pytestmark = pytest.mark.skipif(not uring_available(), reason="io_uring is not available")
+
+
+def test_write_files_uring_no_files():
+    assert write_files_uring([]) == []
+
+
+def test_write_files_uring_skips_existing_files(tmp_path):
+    existing = tmp_path / "existing.py"
+    existing.write_text("original")
+    new = tmp_path / "new.py"
+
+    assert _write_files_uring([(str(existing), "# replaced"), (str(new), "# new")]) == []
+    assert existing.read_text() == "original"
+    assert new.read_text() == "# new"
+
+
+def test_write_files_uring_returns_files_with_missing_parent(tmp_path):
+    orphan = (str(tmp_path / "missing" / "orphan.py"), "")
+    files = [(str(tmp_path / "a.py"), ""), orphan, (str(tmp_path / "b.py"), "# b")]
+
+    assert _write_files_uring(files) == [orphan]
+    assert (tmp_path / "a.py").read_text() == ""
+    assert (tmp_path / "b.py").read_text() == "# b"
+    assert not (tmp_path / "missing").exists()
+
+
+def test_write_files_uring_several_batches(tmp_path):
+    files = [(str(tmp_path / f"f{i}.py"), f"# {i}" if i % 2 else "") for i in range(URING_BATCH_SIZE * 2 + 10)]
+
+    assert _write_files_uring(files) == []
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(f"f{i}.py" for i in range(len(files)))
+    for path, content in files:
+        with open(path, encoding="utf-8") as f:
+            assert f.read() == content
+
+
+def test_write_remaining(tmp_path):
+    path = tmp_path / "short.py"
+    path.write_bytes(b"# sh")
+
+    _write_remaining(str(path), b"# short write", 4)
+    assert path.read_bytes() == b"# short write"
+
+
+SHORT_WRITE_SCRIPT = """
+import resource, signal
+import creatree._uring as uring
+
+uring.uring_available()
+closed = []
+prep_close_direct = uring.liburing.io_uring_prep_close_direct
+uring.liburing.io_uring_prep_close_direct = lambda sqe, slot: closed.append(slot) or prep_close_direct(sqe, slot)
+write_remaining = uring._write_remaining
+
+def lift_limit_and_write_remaining(*args):
+    resource.setrlimit(resource.RLIMIT_FSIZE, (resource.RLIM_INFINITY, resource.RLIM_INFINITY))
+    write_remaining(*args)
+
+uring._write_remaining = lift_limit_and_write_remaining
+# One file per batch, so that the second file reuses the slot of the short-written one
+uring.URING_BATCH_SIZE = 1
+
+# Writes are cut at 4 bytes (and fail with EFBIG instead of killing the process past the limit)
+signal.signal(signal.SIGXFSZ, signal.SIG_IGN)
+resource.setrlimit(resource.RLIMIT_FSIZE, (4, resource.RLIM_INFINITY))
+files = [("short.py", "# short write"), ("next.py", "# next")]
+print("unavailable" if uring.write_files_uring(files) == files else closed)
+"""
+
+
+def test_write_files_uring_short_write(tmp_path):
+    # Run in a subprocess, as the file size limit applies to the whole process
+    env = {**os.environ, "PYTHONPATH": os.path.dirname(os.path.dirname(creatree.__file__))}
+    result = subprocess.run(
+        [sys.executable, "-c", SHORT_WRITE_SCRIPT], cwd=tmp_path, env=env, capture_output=True, text=True, check=True
+    )
+    if result.stdout.strip() == "unavailable":
+        pytest.skip("io_uring cannot be set up on this system")
+
+    # The cancelled `close` of the short-written file is queued again, before its slot is reused
+    assert result.stdout.strip() == "[0, 0, 0]"
+    assert (tmp_path / "short.py").read_text() == "# short write"
+    assert (tmp_path / "next.py").read_text() == "# next"
@@ -1,3 +1,72 @@
-from creatree.cli import main
+import io
+import sys
+from pathlib import Path
 
-# TODO: add tests
+import pytest
+
+from creatree.cli import creatree_cli, main
+
+TREE = "root1/\n├── a\n│   └── b.py\nroot2/\n└── c.py"
+
+
+@pytest.mark.parametrize("absolute", [False, True])
+def test_creatree_cli_summary(tmp_path, monkeypatch, capsys, absolute):
+    monkeypatch.chdir(tmp_path)
+    where = str(tmp_path / "out") if absolute else "out"
+
+    creatree_cli(TREE, where)
+
+    # Relative paths are shown from the (resolved) current working directory
+    out = (Path(where) if absolute else Path.cwd() / where).as_posix()
+    assert capsys.readouterr().out == f"Created trees in '{out}/root1', '{out}/root2'\n"
+    assert (tmp_path / "out" / "root1" / "a" / "b.py").is_file()
+    assert (tmp_path / "out" / "root2" / "c.py").is_file()
+
+
+def test_creatree_cli_summary_single_root(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+
+    creatree_cli("root/\n└── a.py", ".")
+
+    assert capsys.readouterr().out == f"Created tree in '{(Path.cwd() / 'root').as_posix()}'\n"
+
+
+# CRLF line endings and non-ASCII names, decoded as UTF-8 whatever the locale
+CRLF_TREE = "café/ # Café\r\n├── menu.md\r\n└── naïve/\r\n    └── résumé.txt\r\n".encode("utf-8")
+
+
+def _check_crlf_tree(root):
+    assert sorted(path.relative_to(root).as_posix() for path in root.rglob("*")) == [
+        "café",
+        "café/menu.md",
+        "café/naïve",
+        "café/naïve/résumé.txt",
+    ]
+
+
+def test_main_stdin(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["creatree", "-w", str(tmp_path)])
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(CRLF_TREE), encoding="ascii"))
+
+    main()
+
+    _check_crlf_tree(tmp_path)
+    assert capsys.readouterr().out == f"Created tree in '{(tmp_path / 'café').as_posix()}'\n"
+
+
+def test_main_file(tmp_path, monkeypatch, capsys):
+    tree_file = tmp_path / "tree.txt"
+    tree_file.write_bytes(CRLF_TREE)
+    monkeypatch.setattr(sys, "argv", ["creatree", str(tree_file), "-w", str(tmp_path / "out")])
+
+    main()
+
+    _check_crlf_tree(tmp_path / "out")
+    assert capsys.readouterr().out == f"Created tree in '{(tmp_path / 'out' / 'café').as_posix()}'\n"
+
+
+def test_main_missing_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["creatree", str(tmp_path / "missing.txt")])
+
+    with pytest.raises(FileNotFoundError):
+        main()
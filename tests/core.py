@@ -1,3 +1,166 @@
-from creatree.core import creatree, tree_to_dict, create_tree, _build_metadata_list, _build_tree_dict
+import os
 
-# TODO: add tests
+import pytest
+
+from creatree.config import COMMENT_KEY, PARALLEL_PARSE_THRESHOLD, PARALLEL_WRITE_THRESHOLD, STREAM_BATCH_SIZE
+from creatree.core import (
+    creatree,
+    creatree_stream,
+    split_trees,
+    tree_to_dict,
+    tree_to_dicts_parallel,
+    create_tree,
+    _build_metadata_list,
+    _build_tree_dict,
+)
+
+README_TREE = '''
+    example_project/ # Project root
+    │── main.py # Main entry point
+    │── config.yaml # Configuration file
+    │── src # Source code directory (Not empty)
+    │   │── app.py
+    │   │── utils.py
+    │── empty_directory/ # Empty directory (this will be created as it ends with /)
+'''
+
+
+def _snapshot(root):
+    """List the directories and files (along with their content) under `root`."""
+    entries = {}
+    for parent, dirs, files in os.walk(root):
+        for name in dirs:
+            entries[os.path.relpath(os.path.join(parent, name), root)] = None
+        for name in files:
+            path = os.path.join(parent, name)
+            with open(path, encoding="utf-8") as f:
+                entries[os.path.relpath(path, root)] = f.read()
+    return entries
+
+
+def test_tree_to_dict_custom_prefixes():
+    # The indentation glyph of the nested line (`│`) is not part of the custom prefixes
+    tree = "root/\n├── a\n│   └── b.py\n└── c.py"
+    expected = {"root/": {"a": {"b.py": None}, "c.py": None}}
+    assert tree_to_dict(tree, include_comments=False, prefixes=["├──", "└──"]) == expected
+    assert tree_to_dict(tree, include_comments=False) == expected
+
+
+def test_tree_to_dict_comments():
+    tree = "root/# Root\n│── main.py# Main\n│── app.py   #  App  \n│── C#.txt # Sharp\n│── x#y\n"
+    tree += "other #x # Other"
+    assert tree_to_dict(tree) == {
+        "root/": {
+            COMMENT_KEY: "Root",
+            "main.py": {COMMENT_KEY: "Main"},
+            "app.py": {COMMENT_KEY: "App  "},
+            "C#.txt": {COMMENT_KEY: "Sharp"},
+            "x#y": {COMMENT_KEY: ""},
+        },
+        "other #x": {COMMENT_KEY: "Other"},
+    }
+
+
+def test_tree_to_dict_indented_roots():
+    # Only the first line is stripped, so the second root is still indented
+    tree = "    a/\n    │── x.py\n    b/ # B\n    │── y.py"
+    expected = {"a/": {"x.py": None}, "b/": {"y.py": None}}
+    assert tree_to_dict(tree, include_comments=False) == expected
+    assert split_trees(tree) == ["a/\n    │── x.py", "    b/ # B\n    │── y.py"]
+
+
+@pytest.mark.parametrize(
+    "tree",
+    [
+        README_TREE,
+        ".\n├── a/\n│   └── b.txt # hi there\n└── c",
+        "root/\n├── docs/index.md # Docs\n├── x/y/\n└── x/z.py",
+        "root1/\n├── a\n│   └── b.py\nroot2/\n└── c/",
+        "    a/\n    │── x.py\n    b/\n    │── y.py",
+    ],
+)
+def test_creatree_stream_matches_creatree(tmp_path, tree):
+    tree_dict = creatree(tree, tmp_path / "dict")
+    roots = creatree_stream(tree, tmp_path / "stream")
+
+    assert _snapshot(tmp_path / "stream") == _snapshot(tmp_path / "dict")
+    assert [root.relative_to(tmp_path / "stream") for root in roots] == [
+        root.relative_to(tmp_path / "dict") for root in tree_dict
+    ]
+
+
+@pytest.mark.parametrize("fillers", [0, STREAM_BATCH_SIZE - 2, STREAM_BATCH_SIZE + 10])
+def test_creatree_stream_repeated_names(tmp_path, fillers):
+    # The first repeated sibling wins (unlike with `creatree`), wherever the files are flushed
+    filler_lines = "".join(f"├── f{i}\n" for i in range(fillers))
+    tree = "root/\n├── a\n│   └── b\n├── c/\n├── d # First\n" + filler_lines
+    tree += "├── a\n├── c\n├── d # Last\nroot/\n└── e"
+    roots = creatree_stream(tree, tmp_path)
+
+    assert roots == [tmp_path / "root"]
+    assert _snapshot(tmp_path) == {
+        "root": None,
+        "root/a": None,
+        "root/a/b": "",
+        "root/c": None,
+        "root/d": "# First",
+        "root/e": "",
+        **{f"root/f{i}": "" for i in range(fillers)},
+    }
+
+
+@pytest.mark.parametrize("fillers", [0, STREAM_BATCH_SIZE - 1, STREAM_BATCH_SIZE + 10])
+def test_creatree_stream_file_repeated_as_directory(tmp_path, fillers):
+    filler_lines = "".join(f"├── f{i}\n" for i in range(fillers))
+    with pytest.raises(FileExistsError):
+        creatree_stream("root/\n├── a\n" + filler_lines + "├── a\n│   └── b", tmp_path)
+
+
+@pytest.mark.parametrize(
+    "tree, prefixes",
+    [
+        ("root1/\n├── a.py\nroot2/\n└── b/\n.\n└── c.py", None),
+        ("root/\n# generated by tree\n├── a.py\n└── b/\nother/ # Other root\n└── d.py", None),
+        ("root/\n├── a\n│   └── b.py\n└── c.py\nroot2/\n└── d.py", ["├──", "└──"]),
+        (README_TREE + "second_project/\n    │── main.py\n", None),
+    ],
+)
+def test_split_trees_matches_tree_to_dict(tree, prefixes):
+    kwargs = {"prefixes": prefixes} if prefixes else {}
+    trees = split_trees(tree, **kwargs)
+
+    merged = {}
+    for part in trees:
+        merged.update(tree_to_dict(part, **kwargs))
+    assert merged == tree_to_dict(tree, **kwargs)
+    assert len(trees) == len(merged)
+
+
+def test_tree_to_dicts_parallel():
+    tree = "\n".join(f"root{i}/\n├── a{i}.py # A\n└── b{i}/" for i in range(PARALLEL_PARSE_THRESHOLD))
+    trees = split_trees(tree)
+
+    assert len(trees) == PARALLEL_PARSE_THRESHOLD
+    assert tree_to_dicts_parallel(trees, include_comments=False) == [
+        tree_to_dict(tree, include_comments=False) for tree in trees
+    ]
+
+
+def test_create_tree_thread_pool(tmp_path, monkeypatch):
+    # Write the files through the thread pool, even on hosts where io_uring is available
+    monkeypatch.setattr("creatree.core.uring_available", lambda: False)
+    (tmp_path / "root").mkdir()
+    (tmp_path / "root" / "existing.py").write_text("original")
+
+    count = PARALLEL_WRITE_THRESHOLD + 4
+    tree = "root/\n├── existing.py # Replaced\n├── docs/index.md # Docs\n"
+    tree += "".join(f"├── f{i}.py # {i}\n" for i in range(count))
+    create_tree(tree_to_dict(tree), tmp_path)
+
+    assert _snapshot(tmp_path) == {
+        "root": None,
+        "root/docs": None,
+        "root/docs/index.md": "# Docs",
+        "root/existing.py": "original",
+        **{f"root/f{i}.py": f"# {i}" for i in range(count)},
+    }
@@ -1,3 +1,43 @@
-from creatree.utils import build_or_regex, is_root, remove_comments, replace_empty_dict_with_none
+import re
 
-# TODO: add tests
+import pytest
+
+from creatree.core import tree_to_dict
+from creatree.utils import build_or_regex, is_root, iter_lines, remove_comments, replace_empty_dict_with_none
+
+
+def test_build_or_regex_longest_first():
+    # `|-` must not shadow `|--`, whatever the order of the options
+    assert re.match(build_or_regex(["|-", "|--"]), "|-- a/").group() == "|--"
+    assert re.match(build_or_regex(["|--", "|-"]), "|- a/").group() == "|-"
+
+
+def test_tree_to_dict_overlapping_prefixes():
+    assert tree_to_dict("root/\n|-- a/\n|   |-- b", include_comments=False) == {"root/": {"a/": {"b": None}}}
+
+
+def test_tree_to_dict_skips_blank_lines():
+    tree = "\n\nroot/\n\n├── a\n   \n│   └── b.py\n\t\n└── c.py\n\n"
+    assert tree_to_dict(tree, include_comments=False) == {"root/": {"a": {"b.py": None}, "c.py": None}}
+
+
+SEPARATORS = ["\n", "\r\n", "\r", "\x85", "\u2028", "\x0b"]
+
+
+@pytest.mark.parametrize("separator", SEPARATORS)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8])
+def test_iter_lines_matches_splitlines(separator, chunk_size):
+    # Lines of varying length (including empty ones), so that the separators fall on every chunk edge
+    lines = ["", "a", "bc", "", "", "def", "ghij", "k", ""]
+    for text in (separator.join(lines), separator.join(lines) + separator, separator * 3):
+        assert list(iter_lines(text, chunk_size)) == text.splitlines()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 7])
+def test_iter_lines_mixed_separators(chunk_size):
+    text = "a\r\nb\rc\n\r\n\x85d\r\r\ne\n\nf\u2029\r"
+    assert list(iter_lines(text, chunk_size)) == text.splitlines()
+
+
+def test_iter_lines_empty():
+    assert list(iter_lines("")) == []